@@ -4,13 +4,27 @@ Google TTS Service - Text-to-Speech Audio Generation
 This module handles generating .wav files from text using Google Cloud TTS API.
 """
 
+import io
 import os
+import re
+import json
+import asyncio
+import shutil
+import hashlib
+import threading
+import uuid
+import wave
+import weakref
 from datetime import datetime
-from typing import List, Dict, Optional
-from pathlib import Path
-from google.cloud import texttospeech
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Optional
+from xml.sax.saxutils import escape
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from google.cloud import texttospeech
+
 # Load environment variables
 load_dotenv()
 
@@ -47,10 +61,41 @@ TURKISH_VOICES = {
 }
 
 DEFAULT_VOICE = "tr-TR-Wavenet-D"
+
+# Voices that support the StreamingSynthesize RPC
+STREAMING_VOICE_PREFIX = "tr-TR-Chirp3-HD-"
 DEFAULT_OUTPUT_DIR = "training_output"
 
-# Global client
+# LINEAR16 responses are a WAV file with a canonical 44-byte header
+WAV_HEADER_BYTES = 44
+
+# Anything that is not a Unicode letter/digit, '_' or '-' is dropped from filenames
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w-]+')
+
+# Content-addressed cache of synthesized audio (set cache_dir=None to bypass)
+DEFAULT_CACHE_DIR = "tts_cache"
+DEFAULT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+# Retry quota (429) and transient errors with exponential backoff + jitter
+# (policies are built by _retry_policy on first use)
+_RETRY_SETTINGS = {"initial": 1.0, "maximum": 30.0, "multiplier": 2.0, "timeout": 120.0}
+# Per-attempt timeout for synthesize requests (seconds)
+REQUEST_TIMEOUT = 30.0
+
+# google.cloud.texttospeech (protobuf + gRPC) is imported on first use, see _tts()
+_tts_module = None
+
+# Global client, shared by all request threads (the gRPC channel is thread-safe).
+# Always go through get_client(); never create a client per request.
 _client = None
+_client_lock = threading.Lock()
+
+# grpc_asyncio channels are bound to the event loop that created them, so the
+# async clients are shared per loop rather than globally
+_async_clients = weakref.WeakKeyDictionary()
+# Open async_client_session blocks per loop; the last one to exit closes the clients
+_async_client_users = weakref.WeakKeyDictionary()
+_tts_beta_module = None
 
 
 def setup_google_credentials(credentials_path: str = "google_credentials.json"):
@@ -83,16 +128,105 @@ def setup_google_credentials(credentials_path: str = "google_credentials.json"):
     return False
 
 
+def _tts():
+    """Return the google.cloud.texttospeech module, importing it on first use."""
+    global _tts_module
+    if _tts_module is None:
+        from google.cloud import texttospeech
+        _tts_module = texttospeech
+    return _tts_module
+
+
+def _tts_beta():
+    """Return google.cloud.texttospeech_v1beta1 (needed for SSML mark timepoints)."""
+    global _tts_beta_module
+    if _tts_beta_module is None:
+        from google.cloud import texttospeech_v1beta1
+        _tts_beta_module = texttospeech_v1beta1
+    return _tts_beta_module
+
+
+@lru_cache(maxsize=None)
+def _retry_policy(is_async: bool = False):
+    """Build the (Async)Retry policy for synthesize calls on first use."""
+    from google.api_core import exceptions as api_exceptions
+    from google.api_core.retry import Retry, if_exception_type
+    
+    predicate = if_exception_type(
+        api_exceptions.ResourceExhausted,
+        api_exceptions.ServiceUnavailable,
+        api_exceptions.DeadlineExceeded,
+    )
+    if is_async:
+        from google.api_core.retry_async import AsyncRetry
+        return AsyncRetry(predicate=predicate, **_RETRY_SETTINGS)
+    return Retry(predicate=predicate, **_RETRY_SETTINGS)
+
+
 def get_client():
-    """Get or initialize the Google TTS client."""
+    """
+    Get or initialize the shared Google TTS client.
+    
+    The client multiplexes concurrent calls over one gRPC (HTTP/2)
+    channel and is safe to use from any number of threads.
+    """
     global _client
     if _client is None:
-        setup_google_credentials()
-        _client = texttospeech.TextToSpeechClient()
-        print("✅ Google TTS client initialized")
+        with _client_lock:
+            if _client is None:
+                setup_google_credentials()
+                _client = _tts().TextToSpeechClient(transport="grpc")
+                print("✅ Google TTS client initialized")
     return _client
 
 
+def get_async_client(beta: bool = False):
+    """
+    Get or initialize the async Google TTS client for the running event loop.
+    
+    Must be called from a coroutine; every call on the same loop returns
+    the same client and therefore the same gRPC channel.
+    
+    Args:
+        beta: Return a v1beta1 client instead of a v1 client
+    """
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(beta)
+    if client is None:
+        setup_google_credentials()
+        module = _tts_beta() if beta else _tts()
+        client = module.TextToSpeechAsyncClient(transport="grpc_asyncio")
+        clients[beta] = client
+    return client
+
+
+async def close_async_clients():
+    """Close the running loop's async clients and their gRPC channels."""
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.transport.close()
+
+
+@asynccontextmanager
+async def async_client_session():
+    """
+    Keep the running loop's async clients open for the duration of the block.
+    
+    Sessions on the same loop may overlap; the clients (and their gRPC
+    channels) are closed when the last one exits, so a loop that is about
+    to end does not leave its channels behind.
+    """
+    loop = asyncio.get_running_loop()
+    _async_client_users[loop] = _async_client_users.get(loop, 0) + 1
+    try:
+        yield
+    finally:
+        _async_client_users[loop] -= 1
+        if not _async_client_users[loop]:
+            del _async_client_users[loop]
+            await close_async_clients()
+
+
 def get_available_voices() -> Dict[str, str]:
     """Return available Turkish voice options."""
     return TURKISH_VOICES
@@ -110,21 +244,286 @@ def sanitize_filename(text: str, max_length: int = 30) -> str:
         Sanitized filename string
     """
     # Take first few words
-    words = text.split()[:4]
+    words = text.split(maxsplit=4)[:4]
     filename = "_".join(words)
     
-    # Remove/replace unsafe characters
-    safe_chars = []
-    for char in filename:
-        if char.isalnum() or char in ('_', '-'):
-            safe_chars.append(char)
-        elif char == ' ':
-            safe_chars.append('_')
-    
-    result = "".join(safe_chars)[:max_length]
+    # Remove unsafe characters in one C-level pass
+    result = _UNSAFE_FILENAME_CHARS.sub("", filename)[:max_length]
     return result if result else "audio"
 
 
+def _cache_key(
+    text: str,
+    voice_name: str,
+    language_code: str,
+    sample_rate: int,
+    speaking_rate: float,
+    pitch: float,
+    volume_gain_db: float
+) -> str:
+    """Build a cache key covering the text, the voice and every audio parameter."""
+    canonical = "\x1f".join(str(part) for part in (
+        text, voice_name, language_code, sample_rate,
+        float(speaking_rate), float(pitch), float(volume_gain_db)
+    ))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _link_or_copy(src: str, dst: str):
+    """
+    Hardlink src to dst, falling back to a copy (e.g. another filesystem).
+    
+    Goes through a temp name and os.replace, so an existing dst is swapped
+    out rather than rewritten in place; files hard-linked to it keep their bytes.
+    """
+    tmp_path = f"{dst}.{os.getpid()}.{threading.get_ident()}.partial"
+    try:
+        try:
+            os.link(src, tmp_path)
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _load_from_cache(cache_dir: str, key: str, output_path: str) -> Optional[Dict]:
+    """
+    Place a cached audio file at output_path.
+    
+    Returns:
+        The cache entry's metadata, or None on a cache miss
+    """
+    meta_path = os.path.join(cache_dir, f"{key}.json")
+    cache_path = os.path.join(cache_dir, f"{key}.wav")
+    
+    # The sidecar is written last, so its presence marks a complete entry
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        _link_or_copy(cache_path, output_path)
+        
+        # Mark as recently used for prune_tts_cache
+        os.utime(cache_path)
+    except (OSError, ValueError):
+        return None
+    
+    return meta
+
+
+def _store_in_cache(cache_dir: str, key: str, audio_path: str, meta: Dict):
+    """Add a freshly synthesized file to the cache (failures only cost a future miss)."""
+    meta_path = os.path.join(cache_dir, f"{key}.json")
+    
+    # A concurrent miss on the same key already stored it
+    if os.path.exists(meta_path):
+        return
+    
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_path = os.path.join(cache_dir, f"{key}.wav")
+        _link_or_copy(audio_path, cache_path)
+        
+        meta = dict(meta, path=cache_path, created_at=datetime.now().isoformat())
+        _write_file_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+    except OSError as e:
+        print(f"⚠️ Could not write TTS cache entry: {e}")
+
+
+def prune_tts_cache(
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    max_bytes: int = DEFAULT_CACHE_MAX_BYTES
+) -> int:
+    """
+    Evict least recently used cache entries until the cache fits in max_bytes.
+    
+    Args:
+        cache_dir: The TTS cache directory
+        max_bytes: Size budget for the cached .wav files
+    
+    Returns:
+        Number of entries evicted
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+    
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".wav"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    
+    total = sum(size for _, size, _ in entries)
+    evicted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        for stale in (os.path.splitext(path)[0] + ".json", path):
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+        total -= size
+        evicted += 1
+    
+    if evicted:
+        print(f"🧹 Evicted {evicted} TTS cache entries")
+    return evicted
+
+
+def _build_voice_config(
+    voice_name: str,
+    language_code: str,
+    sample_rate: int,
+    speaking_rate: float,
+    pitch: float,
+    volume_gain_db: float,
+    texttospeech=None
+):
+    """Build the (voice, audio_config) messages, which are identical across a batch."""
+    texttospeech = texttospeech or _tts()
+    
+    # Configure voice
+    voice = texttospeech.VoiceSelectionParams(
+        language_code=language_code,
+        name=voice_name
+    )
+    
+    # Configure audio output
+    audio_config = texttospeech.AudioConfig(
+        audio_encoding=texttospeech.AudioEncoding.LINEAR16,
+        sample_rate_hertz=sample_rate,
+        speaking_rate=speaking_rate,
+        pitch=pitch,
+        volume_gain_db=volume_gain_db
+    )
+    
+    return voice, audio_config
+
+
+def _build_synthesis_config(
+    text: str,
+    voice_name: str,
+    language_code: str,
+    sample_rate: int,
+    speaking_rate: float,
+    pitch: float,
+    volume_gain_db: float
+):
+    """Build the (input, voice, audio_config) messages for a synthesize request."""
+    voice, audio_config = _build_voice_config(
+        voice_name, language_code, sample_rate, speaking_rate, pitch, volume_gain_db
+    )
+    return _tts().SynthesisInput(text=text), voice, audio_config
+
+
+def _pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap 16-bit mono PCM in a WAV header."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def _write_file_atomic(path: str, data: bytes):
+    """
+    Write data to path via a sibling temp file and os.replace.
+    
+    Readers never see a half-written file, and a path hard-linked into the
+    TTS cache is replaced rather than overwritten in place.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.partial"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp_path)
+        raise
+    os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def _save_audio(
+    audio_content: bytes,
+    output_path: str,
+    text: str,
+    voice_name: str,
+    language_code: str,
+    sample_rate: int,
+    speaking_rate: float,
+    pitch: float,
+    volume_gain_db: float,
+    cache_dir: Optional[str],
+    cache_key: Optional[str]
+) -> Dict:
+    """Write synthesized LINEAR16 audio to output_path, add it to the cache and build the result."""
+    # Ensure output directory exists
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    
+    # Write the audio file atomically
+    _write_file_atomic(output_path, audio_content)
+    
+    # Duration of the 16-bit mono PCM after the WAV header (22050Hz: 44100 bytes per second)
+    file_size = len(audio_content)
+    duration_seconds = max(0, file_size - WAV_HEADER_BYTES) / (sample_rate * 2)
+    
+    print(f"✅ Audio saved: {output_path} ({duration_seconds:.1f}s)")
+    
+    if cache_key:
+        _store_in_cache(cache_dir, cache_key, output_path, {
+            "text": text,
+            "voice": voice_name,
+            "params": {
+                "language_code": language_code,
+                "sample_rate": sample_rate,
+                "speaking_rate": speaking_rate,
+                "pitch": pitch,
+                "volume_gain_db": volume_gain_db
+            },
+            "duration_seconds": round(duration_seconds, 2),
+            "file_size_bytes": file_size
+        })
+    
+    return {
+        "success": True,
+        "path": output_path,
+        "text": text,
+        "voice": voice_name,
+        "duration_seconds": round(duration_seconds, 2),
+        "file_size_bytes": file_size
+    }
+
+
+def _cached_result(meta: Dict, output_path: str, text: str, voice_name: str) -> Dict:
+    """Build a synthesize_speech result for a cache hit."""
+    return {
+        "success": True,
+        "path": output_path,
+        "text": text,
+        "voice": voice_name,
+        "duration_seconds": meta.get("duration_seconds"),
+        "file_size_bytes": meta.get("file_size_bytes"),
+        "cache_hit": True
+    }
+
+
 def synthesize_speech(
     text: str,
     output_path: str,
@@ -133,11 +532,18 @@ def synthesize_speech(
     sample_rate: int = 22050,
     speaking_rate: float = 1.0,
     pitch: float = 0.0,
-    volume_gain_db: float = 0.0
+    volume_gain_db: float = 0.0,
+    client: Optional["texttospeech.TextToSpeechClient"] = None,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR
 ) -> Dict:
     """
     Generate a .wav file from text using Google TTS.
     
+    Identical requests are served from the on-disk cache in cache_dir
+    without calling the API (result has cache_hit=True). Voices that
+    support streaming are streamed straight to disk when no pitch/volume
+    adjustment is requested, falling back to a unary request on failure.
+    
     Args:
         text: The text to synthesize
         output_path: Full path for the output .wav file
@@ -147,29 +553,37 @@ def synthesize_speech(
         speaking_rate: Speed of speech (0.25 to 4.0)
         pitch: Voice pitch (-20.0 to 20.0 semitones)
         volume_gain_db: Volume gain (-96.0 to 16.0 dB)
+        client: TTS client to use (defaults to the shared client)
+        cache_dir: TTS cache directory, or None to always call the API
     
     Returns:
         Dict with file info (path, duration estimate, etc.)
     """
+    # The streaming RPC cannot apply pitch/volume adjustments
+    if supports_streaming(voice_name) and pitch == 0.0 and volume_gain_db == 0.0:
+        result = synthesize_speech_streaming(
+            text, output_path, voice_name, language_code, sample_rate,
+            speaking_rate, client=client, cache_dir=cache_dir
+        )
+        if result.get("success"):
+            return result
+        print(f"⚠️ Streaming failed, retrying as a unary request: {text[:50]}...")
+    
     try:
-        client = get_client()
+        cache_key = None
+        if cache_dir:
+            cache_key = _cache_key(text, voice_name, language_code, sample_rate,
+                                   speaking_rate, pitch, volume_gain_db)
+            cached = _load_from_cache(cache_dir, cache_key, output_path)
+            if cached:
+                print(f"♻️ TTS cache hit: {text[:50]}...")
+                return _cached_result(cached, output_path, text, voice_name)
         
-        # Set up synthesis input
-        synthesis_input = texttospeech.SynthesisInput(text=text)
+        client = client or get_client()
         
-        # Configure voice
-        voice = texttospeech.VoiceSelectionParams(
-            language_code=language_code,
-            name=voice_name
-        )
-        
-        # Configure audio output
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.LINEAR16,
-            sample_rate_hertz=sample_rate,
-            speaking_rate=speaking_rate,
-            pitch=pitch,
-            volume_gain_db=volume_gain_db
+        synthesis_input, voice, audio_config = _build_synthesis_config(
+            text, voice_name, language_code, sample_rate,
+            speaking_rate, pitch, volume_gain_db
         )
         
         # Make the API request
@@ -177,25 +591,146 @@ def synthesize_speech(
         response = client.synthesize_speech(
             input=synthesis_input,
             voice=voice,
-            audio_config=audio_config
+            audio_config=audio_config,
+            retry=_retry_policy(),
+            timeout=REQUEST_TIMEOUT
+        )
+        
+        return _save_audio(
+            response.audio_content, output_path, text, voice_name,
+            language_code, sample_rate, speaking_rate, pitch, volume_gain_db,
+            cache_dir, cache_key
         )
         
+    except Exception as e:
+        print(f"❌ TTS synthesis error: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "text": text
+        }
+
+
+def supports_streaming(voice_name: str) -> bool:
+    """Check whether a voice can be used with streaming synthesis."""
+    return voice_name.startswith(STREAMING_VOICE_PREFIX)
+
+
+def supports_ssml_marks(voice_name: str) -> bool:
+    """Check whether a voice accepts SSML (and so <mark> timepoints); Chirp 3 HD does not."""
+    return not voice_name.startswith(STREAMING_VOICE_PREFIX)
+
+
+def synthesize_speech_streaming(
+    text: str,
+    output_path: str,
+    voice_name: str,
+    language_code: str = "tr-TR",
+    sample_rate: int = 22050,
+    speaking_rate: float = 1.0,
+    client: Optional["texttospeech.TextToSpeechClient"] = None,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR
+) -> Dict:
+    """
+    Generate a .wav file using the streaming RPC, writing audio as it arrives.
+    
+    Only Chirp 3 HD voices support streaming, and pitch/volume gain cannot
+    be set. The PCM chunks are written straight into a WAV container, so the
+    full response is never buffered in memory.
+    
+    Args:
+        text: The text to synthesize
+        output_path: Full path for the output .wav file
+        voice_name: Google TTS voice name (must support streaming)
+        language_code: Language code
+        sample_rate: Audio sample rate (22050 for XTTS compatibility)
+        speaking_rate: Speed of speech (0.25 to 2.0)
+        client: TTS client to use (defaults to the shared client)
+        cache_dir: TTS cache directory, or None to always call the API
+    
+    Returns:
+        Dict with file info (path, duration estimate, etc.)
+    """
+    try:
+        # Same key as a unary request without pitch/volume adjustments
+        cache_key = None
+        if cache_dir:
+            cache_key = _cache_key(text, voice_name, language_code, sample_rate,
+                                   speaking_rate, 0.0, 0.0)
+            cached = _load_from_cache(cache_dir, cache_key, output_path)
+            if cached:
+                print(f"♻️ TTS cache hit: {text[:50]}...")
+                return _cached_result(cached, output_path, text, voice_name)
+        
+        client = client or get_client()
+        texttospeech = _tts()
+        
+        streaming_config = texttospeech.StreamingSynthesizeConfig(
+            voice=texttospeech.VoiceSelectionParams(
+                language_code=language_code,
+                name=voice_name
+            ),
+            streaming_audio_config=texttospeech.StreamingAudioConfig(
+                audio_encoding=texttospeech.AudioEncoding.PCM,
+                sample_rate_hertz=sample_rate,
+                speaking_rate=speaking_rate
+            )
+        )
+        
+        # First request carries the config, the following ones the text
+        stream_requests = [
+            texttospeech.StreamingSynthesizeRequest(streaming_config=streaming_config),
+            texttospeech.StreamingSynthesizeRequest(
+                input=texttospeech.StreamingSynthesisInput(text=text)
+            )
+        ]
+        
+        print(f"🔊 Streaming audio for: {text[:50]}... (Rate: {speaking_rate})")
+        responses = client.streaming_synthesize(iter(stream_requests))
+        
         # Ensure output directory exists
         output_dir = os.path.dirname(output_path)
         if output_dir:
             os.makedirs(output_dir, exist_ok=True)
         
-        # Write the audio file
-        with open(output_path, "wb") as out:
-            out.write(response.audio_content)
+        # 16-bit mono PCM; the WAV header sizes are patched on close. Chunks go
+        # to a sibling temp file that only replaces output_path once complete.
+        pcm_bytes = 0
+        tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.partial"
+        try:
+            with wave.open(tmp_path, "wb") as wav_file:
+                wav_file.setnchannels(1)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(sample_rate)
+                for response in responses:
+                    wav_file.writeframesraw(response.audio_content)
+                    pcm_bytes += len(response.audio_content)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
         
-        # Calculate approximate duration (rough estimate)
-        file_size = os.path.getsize(output_path)
-        # For 22050Hz, 16-bit mono: ~44100 bytes per second
-        duration_seconds = file_size / (sample_rate * 2)
+        file_size = WAV_HEADER_BYTES + pcm_bytes
+        duration_seconds = pcm_bytes / (sample_rate * 2)
         
         print(f"✅ Audio saved: {output_path} ({duration_seconds:.1f}s)")
         
+        if cache_key:
+            _store_in_cache(cache_dir, cache_key, output_path, {
+                "text": text,
+                "voice": voice_name,
+                "params": {
+                    "language_code": language_code,
+                    "sample_rate": sample_rate,
+                    "speaking_rate": speaking_rate,
+                    "pitch": 0.0,
+                    "volume_gain_db": 0.0
+                },
+                "duration_seconds": round(duration_seconds, 2),
+                "file_size_bytes": file_size
+            })
+        
         return {
             "success": True,
             "path": output_path,
@@ -205,6 +740,70 @@ def synthesize_speech(
             "file_size_bytes": file_size
         }
         
+    except Exception as e:
+        print(f"❌ TTS streaming synthesis error: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "text": text
+        }
+
+
+async def _synthesize_one_async(
+    async_client: "texttospeech.TextToSpeechAsyncClient",
+    semaphore: asyncio.Semaphore,
+    text: str,
+    output_path: str,
+    voice_name: str = DEFAULT_VOICE,
+    language_code: str = "tr-TR",
+    sample_rate: int = 22050,
+    speaking_rate: float = 1.0,
+    pitch: float = 0.0,
+    volume_gain_db: float = 0.0,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+    voice_config: Optional[tuple] = None
+) -> Dict:
+    """
+    Async counterpart of synthesize_speech; at most `semaphore` requests run at once.
+    
+    voice_config is an optional prebuilt (voice, audio_config) pair from
+    _build_voice_config, shared by every item of a batch.
+    """
+    try:
+        cache_key = None
+        if cache_dir:
+            cache_key = _cache_key(text, voice_name, language_code, sample_rate,
+                                   speaking_rate, pitch, volume_gain_db)
+            cached = await asyncio.to_thread(_load_from_cache, cache_dir, cache_key, output_path)
+            if cached:
+                print(f"♻️ TTS cache hit: {text[:50]}...")
+                return _cached_result(cached, output_path, text, voice_name)
+        
+        if voice_config is None:
+            voice_config = _build_voice_config(
+                voice_name, language_code, sample_rate,
+                speaking_rate, pitch, volume_gain_db
+            )
+        voice, audio_config = voice_config
+        synthesis_input = _tts().SynthesisInput(text=text)
+        
+        async with semaphore:
+            print(f"🔊 Generating audio for: {text[:50]}... (Rate: {speaking_rate}, Pitch: {pitch}, Vol: {volume_gain_db}dB)")
+            response = await async_client.synthesize_speech(
+                input=synthesis_input,
+                voice=voice,
+                audio_config=audio_config,
+                retry=_retry_policy(is_async=True),
+                timeout=REQUEST_TIMEOUT
+            )
+        
+        # File I/O runs off the event loop
+        return await asyncio.to_thread(
+            _save_audio, response.audio_content, output_path, text, voice_name,
+            language_code, sample_rate, speaking_rate, pitch, volume_gain_db,
+            cache_dir, cache_key
+        )
+        
     except Exception as e:
         print(f"❌ TTS synthesis error: {e}")
         return {
@@ -214,60 +813,228 @@ def synthesize_speech(
         }
 
 
-def batch_synthesize(
+async def _synthesize_group_async(
+    async_client: "texttospeech.TextToSpeechAsyncClient",
+    semaphore: asyncio.Semaphore,
+    group: List[tuple],
+    voice_name: str,
+    voice_config: tuple,
+    beta_voice_config: tuple,
+    sample_rate: int = 22050
+) -> List[Dict]:
+    """
+    Synthesize several sentences with one SSML request and split the audio at <mark>s.
+    
+    group holds (index, text, output_path) tuples. Mark timepoints are only
+    returned by the v1beta1 API. Any failure falls back to one request per
+    sentence. Split clips are not cached because their prosody comes from
+    the combined utterance.
+    """
+    try:
+        tts_beta = _tts_beta()
+        beta_client = get_async_client(beta=True)
+        voice, audio_config = beta_voice_config
+        ssml = "<speak>" + "".join(
+            f'<mark name="s{n}"/>{escape(text)} ' for n, (_, text, _) in enumerate(group)
+        ) + "</speak>"
+        
+        async with semaphore:
+            print(f"🔊 Generating audio for {len(group)} sentences in one SSML request...")
+            response = await beta_client.synthesize_speech(
+                request=tts_beta.SynthesizeSpeechRequest(
+                    input=tts_beta.SynthesisInput(ssml=ssml),
+                    voice=voice,
+                    audio_config=audio_config,
+                    enable_time_pointing=[tts_beta.SynthesizeSpeechRequest.TimepointType.SSML_MARK]
+                ),
+                retry=_retry_policy(is_async=True),
+                timeout=REQUEST_TIMEOUT
+            )
+        
+        # Byte offset of each sentence in the PCM after the WAV header
+        marks = {tp.mark_name: tp.time_seconds for tp in response.timepoints}
+        pcm = response.audio_content[WAV_HEADER_BYTES:]
+        offsets = [int(marks[f"s{n}"] * sample_rate) * 2 for n in range(len(group))]
+        offsets.append(len(pcm))
+        if offsets != sorted(offsets):
+            raise ValueError("SSML mark timepoints out of order")
+        
+        results = []
+        for n, (_, text, output_path) in enumerate(group):
+            clip = _pcm_to_wav(pcm[offsets[n]:offsets[n + 1]], sample_rate)
+            results.append(await asyncio.to_thread(
+                _save_audio, clip, output_path, text, voice_name, "tr-TR",
+                sample_rate, 1.0, 0.0, 0.0, None, None
+            ))
+        return results
+        
+    except Exception as e:
+        print(f"⚠️ SSML batch failed ({e}), falling back to one request per sentence")
+        return await asyncio.gather(*(
+            _synthesize_one_async(
+                async_client, semaphore, text, output_path,
+                voice_name=voice_name, voice_config=voice_config
+            )
+            for _, text, output_path in group
+        ))
+
+
+@lru_cache(maxsize=32)
+def _default_voice_config(voice_name: str) -> tuple:
+    """(voice, audio_config) for a voice at the default tr-TR/22050Hz settings, built once."""
+    return _build_voice_config(voice_name, "tr-TR", 22050, 1.0, 0.0, 0.0)
+
+
+async def synthesize_speech_async(
+    text: str,
+    output_path: str,
+    semaphore: asyncio.Semaphore,
+    voice_name: str = DEFAULT_VOICE
+) -> Dict:
+    """
+    Generate a .wav file from text on the running loop's shared async client.
+    
+    For callers that synthesize sentences one at a time as they arrive;
+    run it inside async_client_session() so the client's channel is closed
+    afterwards. At most `semaphore` requests run at once.
+    
+    Args:
+        text: The text to synthesize
+        output_path: Full path for the output .wav file
+        semaphore: Limits concurrent TTS requests across the caller's tasks
+        voice_name: Google TTS voice name
+    
+    Returns:
+        Dict with file info (path, duration estimate, etc.)
+    """
+    return await _synthesize_one_async(
+        get_async_client(), semaphore, text, output_path,
+        voice_name=voice_name, voice_config=_default_voice_config(voice_name)
+    )
+
+
+async def batch_synthesize_async(
     items: List[Dict],
     output_dir: str = DEFAULT_OUTPUT_DIR,
-    voice_name: str = DEFAULT_VOICE
+    voice_name: str = DEFAULT_VOICE,
+    concurrency: int = 10,
+    sentences_per_request: int = 1
 ) -> List[Dict]:
     """
-    Generate .wav files for multiple sentences.
+    Generate .wav files for multiple sentences concurrently.
     
     Args:
         items: List of dicts with 'text' and optionally 'word' keys
         output_dir: Directory to save .wav files
         voice_name: Google TTS voice to use
+        concurrency: Maximum simultaneous TTS requests (keep within your API quota)
+        sentences_per_request: Pack up to this many sentences into one SSML
+            request and split the audio at <mark> timepoints (voices that
+            accept SSML only; 1 disables packing)
     
     Returns:
-        List of result dicts with file paths and status
+        List of result dicts with file paths and status, in input order
     """
     os.makedirs(output_dir, exist_ok=True)
     
-    results = []
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    # Voice/audio settings are the same for every item: build the protos once
+    voice_config = _build_voice_config(voice_name, "tr-TR", 22050, 1.0, 0.0, 0.0)
+    
+    results = [None] * len(items)
+    jobs = []
+    
     for i, item in enumerate(items):
         text = item.get("text", "")
         if not text:
-            results.append({"success": False, "error": "Empty text", "index": i})
+            results[i] = {"success": False, "error": "Empty text", "index": i}
             continue
         
         # Generate filename
         text_part = sanitize_filename(text)
         filename = f"train_{timestamp}_{i:03d}_{text_part}.wav"
         output_path = os.path.join(output_dir, filename)
+        jobs.append((i, text, output_path))
+    
+    # All requests on this loop share one gRPC channel, closed when the batch ends
+    async with async_client_session():
+        async_client = get_async_client()
         
-        # Synthesize
-        result = synthesize_speech(
-            text=text,
-            output_path=output_path,
-            voice_name=voice_name
-        )
+        # Each pending coroutine covers one or more item indices
+        pending = []
+        if sentences_per_request > 1 and supports_ssml_marks(voice_name):
+            beta_voice_config = _build_voice_config(voice_name, "tr-TR", 22050, 1.0, 0.0, 0.0, _tts_beta())
+            for start in range(0, len(jobs), sentences_per_request):
+                group = jobs[start:start + sentences_per_request]
+                pending.append(([i for i, _, _ in group], _synthesize_group_async(
+                    async_client, semaphore, group, voice_name, voice_config, beta_voice_config
+                )))
+        else:
+            for i, text, output_path in jobs:
+                pending.append(([i], _synthesize_one_async(
+                    async_client, semaphore, text, output_path,
+                    voice_name=voice_name, voice_config=voice_config
+                )))
         
-        result["index"] = i
-        result["word"] = item.get("word", "")
-        results.append(result)
+        gathered = await asyncio.gather(*(coro for _, coro in pending), return_exceptions=True)
+    
+    for (indices, _), outcome in zip(pending, gathered):
+        for n, i in enumerate(indices):
+            if isinstance(outcome, BaseException):
+                result = {"success": False, "error": str(outcome), "text": items[i].get("text", "")}
+            else:
+                result = outcome[n] if isinstance(outcome, list) else outcome
+            result["index"] = i
+            result["word"] = items[i].get("word", "")
+            results[i] = result
     
     # Summary
     successful = sum(1 for r in results if r.get("success"))
     print(f"\n📊 Batch complete: {successful}/{len(items)} files generated")
     
+    await asyncio.to_thread(prune_tts_cache)
+    
     return results
 
 
+def batch_synthesize(
+    items: List[Dict],
+    output_dir: str = DEFAULT_OUTPUT_DIR,
+    voice_name: str = DEFAULT_VOICE,
+    concurrency: int = 10,
+    sentences_per_request: int = 1
+) -> List[Dict]:
+    """
+    Generate .wav files for multiple sentences.
+    
+    Synchronous wrapper around batch_synthesize_async; must not be called
+    from inside a running event loop.
+    
+    Args:
+        items: List of dicts with 'text' and optionally 'word' keys
+        output_dir: Directory to save .wav files
+        voice_name: Google TTS voice to use
+        concurrency: Maximum simultaneous TTS requests
+        sentences_per_request: Sentences packed into one SSML request (1 disables)
+    
+    Returns:
+        List of result dicts with file paths and status
+    """
+    return asyncio.run(batch_synthesize_async(
+        items, output_dir, voice_name, concurrency, sentences_per_request
+    ))
+
+
 def generate_training_filename(text: str, output_dir: str = DEFAULT_OUTPUT_DIR) -> str:
     """
     Generate a standardized training filename.
     
+    The timestamp only resolves to the second and the text part only keeps
+    the first few words, so a random suffix keeps concurrent names unique.
+    
     Args:
         text: The sentence text
         output_dir: Output directory
@@ -277,7 +1044,7 @@ def generate_training_filename(text: str, output_dir: str = DEFAULT_OUTPUT_DIR)
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     text_part = sanitize_filename(text)
-    filename = f"train_{timestamp}_{text_part}.wav"
+    filename = f"train_{timestamp}_{text_part}_{uuid.uuid4().hex[:8]}.wav"
     return os.path.join(output_dir, filename)
 
 
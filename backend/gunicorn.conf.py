@@ -0,0 +1,21 @@
+"""
+Gunicorn configuration for the Training Data Generator backend.
+
+Uses threaded workers rather than gevent: the Google TTS client talks gRPC,
+which does not cooperate with gevent's monkey-patching. Blocking TTS, LLM
+and ZIP requests each get their own thread, so they no longer queue behind
+one another the way they do on the Flask dev server.
+"""
+
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5001")
+worker_class = "gthread"
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+
+# Long sentence batches and large ZIP downloads can take a while
+timeout = 300
+
+# Do not preload: the gRPC channel must be created after workers fork
+preload_app = False
@@ -7,9 +7,16 @@ containing mispronounced words for TTS training data.
 
 import os
 import json
+import math
+import orjson
 import requests
-from typing import List, Optional
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from typing import Callable, List, Optional
 from dotenv import load_dotenv
+from urllib3.util.retry import Retry
 
 # Load environment variables
 load_dotenv()
@@ -22,6 +29,24 @@ _ollama_model = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
 # OpenAI client (lazy initialized)
 _openai_client = None
 
+# Pooled HTTP session for Ollama: keep-alive reuses connections across batches/retries.
+# Refused connections are not retried so the availability probe still fails fast.
+_http = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, connect=0, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+)
+_http.mount("http://", _http_adapter)
+_http.mount("https://", _http_adapter)
+
+# Upper bound on concurrent batch prompts in generate_sentences
+MAX_LLM_WORKERS = 8
+
+# (connect, read) timeouts for Ollama generation requests
+OLLAMA_GENERATE_TIMEOUT = (3.05, 120)
+OLLAMA_REGENERATE_TIMEOUT = (3.05, 60)
+
 
 def get_current_config():
     """Get current LLM configuration."""
@@ -52,7 +77,7 @@ def set_provider(provider: str, model: str = None):
 def _check_ollama_available():
     """Check if Ollama server is running."""
     try:
-        response = requests.get(f"{_ollama_base_url}/api/tags", timeout=2)
+        response = _http.get(f"{_ollama_base_url}/api/tags", timeout=2)
         return response.status_code == 200
     except:
         return False
@@ -61,9 +86,9 @@ def _check_ollama_available():
 def get_ollama_models():
     """Get list of available Ollama models."""
     try:
-        response = requests.get(f"{_ollama_base_url}/api/tags", timeout=5)
+        response = _http.get(f"{_ollama_base_url}/api/tags", timeout=5)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             return [model["name"] for model in data.get("models", [])]
         return []
     except Exception as e:
@@ -93,19 +118,17 @@ def _get_openai_client():
     return _openai_client
 
 
-def _build_prompt(word: str, count: int, context: str = None, existing_sentences: List[str] = None, language: str = "Turkish"):
-    """Build the prompt for sentence generation."""
-    context_instruction = f"The sentences should be related to {context} domain." if context else ""
+@lru_cache(maxsize=512)
+def _build_prompt_base(word: str, count: int, context: str = None, language: str = "Turkish"):
+    """
+    Build the static parts of the sentence generation prompt.
     
-    existing_instruction = ""
-    if existing_sentences:
-        existing_list = "\n".join([f"- {s}" for s in existing_sentences[-20:]])
-        existing_instruction = f"""
-IMPORTANT: Do NOT repeat or paraphrase these existing sentences:
-{existing_list}
-"""
+    Returns the (head, tail) around the existing-sentences block so retries
+    for the same word only rebuild that block.
+    """
+    context_instruction = f"The sentences should be related to {context} domain." if context else ""
     
-    return f"""You are a {language} language expert creating training sentences for a Text-to-Speech system.
+    head = f"""You are a {language} language expert creating training sentences for a Text-to-Speech system.
 
 Generate exactly {count} natural {language} sentences that include the term "{word}".
 
@@ -119,12 +142,30 @@ CRITICAL REQUIREMENTS:
 - Include the term at different positions in the sentences
 - Vary sentence structures (statements, commands, questions if appropriate)
 {context_instruction}
-{existing_instruction}
+"""
+    tail = """
 
 IMPORTANT: Return ONLY a valid JSON array of strings. No explanations, no markdown, just the JSON array.
 
 Example format:
 ["First sentence here.", "Second sentence here.", "Third sentence here."]"""
+    return head, tail
+
+
+def _build_prompt(word: str, count: int, context: str = None, existing_sentences: List[str] = None, language: str = "Turkish"):
+    """Build the prompt for sentence generation."""
+    head, tail = _build_prompt_base(word, count, context, language)
+    
+    existing_instruction = ""
+    if existing_sentences:
+        recent = islice(existing_sentences, max(0, len(existing_sentences) - 20), None)
+        existing_list = "\n".join(f"- {s}" for s in recent)
+        existing_instruction = f"""
+IMPORTANT: Do NOT repeat or paraphrase these existing sentences:
+{existing_list}
+"""
+    
+    return head + existing_instruction + tail
 
 
 def _generate_with_openai(prompt: str, temperature: float = 0.8, max_tokens: int = 2000) -> List[str]:
@@ -148,28 +189,60 @@ def _generate_with_openai(prompt: str, temperature: float = 0.8, max_tokens: int
     return _parse_json_response(content)
 
 
-def _generate_with_ollama(prompt: str, temperature: float = 0.8) -> List[str]:
-    """Generate sentences using Ollama."""
+def _iter_ollama_tokens(response):
+    """Yield response tokens from a streaming Ollama /api/generate reply."""
+    for line in response.iter_lines():
+        if not line:
+            continue
+        chunk = orjson.loads(line)
+        if "error" in chunk:
+            raise Exception(chunk["error"])
+        yield chunk.get("response", "")
+        if chunk.get("done"):
+            break
+
+
+def _generate_with_ollama(prompt: str, temperature: float = 0.8, count: int = None) -> List[str]:
+    """
+    Generate sentences using Ollama.
+    
+    The reply is streamed and parsed as it arrives; once a complete JSON
+    array with at least `count` entries is seen the stream is closed
+    instead of waiting for the model to finish.
+    """
     try:
-        response = requests.post(
+        with _http.post(
             f"{_ollama_base_url}/api/generate",
             json={
                 "model": _ollama_model,
                 "prompt": prompt,
-                "stream": False,
+                "stream": True,
                 "options": {
                     "temperature": temperature
                 }
             },
-            timeout=120
-        )
-        
-        if response.status_code != 200:
-            raise Exception(f"Ollama API error: {response.status_code}")
+            timeout=OLLAMA_GENERATE_TIMEOUT,
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                raise Exception(f"Ollama API error: {response.status_code}")
+            
+            buf = ""
+            for token in _iter_ollama_tokens(response):
+                buf += token
+                if "]" not in token:
+                    continue
+                start_idx = buf.find("[")
+                if start_idx == -1:
+                    continue
+                try:
+                    sentences = orjson.loads(buf[start_idx:buf.rfind("]") + 1])
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(sentences, list) and len(sentences) >= (count or 1):
+                    return sentences
         
-        data = response.json()
-        content = data.get("response", "").strip()
-        return _parse_json_response(content)
+        return _parse_json_response(buf.strip())
         
     except requests.exceptions.ConnectionError:
         raise Exception("Ollama server not running. Start with 'ollama serve'")
@@ -191,7 +264,8 @@ def _parse_json_response(content: str) -> List[str]:
     if start_idx != -1 and end_idx != -1:
         content = content[start_idx:end_idx + 1]
     
-    sentences = json.loads(content)
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers' handlers still apply
+    sentences = orjson.loads(content)
     
     if not isinstance(sentences, list):
         raise ValueError("Response is not a list")
@@ -199,12 +273,28 @@ def _parse_json_response(content: str) -> List[str]:
     return sentences
 
 
+def _dedupe_key(sentence: str) -> str:
+    """Key under which sentences count as duplicates (ignores case and spacing)."""
+    return " ".join(sentence.split()).casefold()
+
+
+def _ollama_batch(prompt: str, count: int = None) -> List[str]:
+    """Run one generation prompt against Ollama."""
+    return _generate_with_ollama(prompt, count=count)
+
+
+def _openai_batch(prompt: str, count: int = None) -> List[str]:
+    """Run one generation prompt against OpenAI."""
+    return _generate_with_openai(prompt)
+
+
 def generate_sentences(
     word: str,
     count: int = 5,
     context: Optional[str] = None,
     language: str = "Turkish",
-    provider: str = None
+    provider: str = None,
+    on_batch: Optional[Callable[[List[str]], None]] = None
 ) -> List[str]:
     """
     Generate natural sentences containing the specified word.
@@ -215,6 +305,8 @@ def generate_sentences(
         context: Optional context/domain (e.g., "aviation", "technical")
         language: Language for sentences (default: Turkish)
         provider: Override the default provider (openai/ollama)
+        on_batch: Called with each batch of newly accepted sentences as soon
+            as it is available (at most `count` sentences in total)
     
     Returns:
         List of generated sentences containing the word
@@ -222,10 +314,52 @@ def generate_sentences(
     active_provider = provider or _current_provider
     count = max(1, count)
     
+    # Resolve the provider once instead of on every batch/retry
+    generate_batch = _ollama_batch if active_provider == "ollama" else _openai_batch
+    dedupe_key = _dedupe_key
+    
     all_sentences = []
+    seen = set()
     batch_size = 10
     max_retries_per_batch = 3
+    word_lower = word.lower()
+    emitted = 0
     
+    def _emit_new():
+        nonlocal emitted
+        if on_batch and emitted < min(len(all_sentences), count):
+            on_batch(all_sentences[emitted:count])
+            emitted = min(len(all_sentences), count)
+    
+    # First pass: issue every batch prompt concurrently and dedupe afterwards
+    n_batches = math.ceil(count / batch_size)
+    batch_sizes = [min(batch_size, count - i * batch_size) for i in range(n_batches)]
+    
+    with ThreadPoolExecutor(max_workers=min(n_batches, MAX_LLM_WORKERS)) as executor:
+        futures = [
+            executor.submit(
+                generate_batch,
+                _build_prompt(word=word, count=size, context=context, language=language),
+                size
+            )
+            for size in batch_sizes
+        ]
+        for future in as_completed(futures):
+            try:
+                for s in future.result():
+                    key = dedupe_key(s)
+                    if word_lower in s.lower() and key not in seen:
+                        seen.add(key)
+                        all_sentences.append(s)
+            except json.JSONDecodeError as e:
+                print(f"❌ Failed to parse response as JSON: {e}")
+            except Exception as e:
+                print(f"❌ Error generating sentences: {e}")
+            _emit_new()
+    
+    print(f"✅ Generated {len(all_sentences)} sentences for '{word}' using {active_provider} in {n_batches} parallel batch(es) (target: {count})")
+    
+    # Top up any shortfall sequentially, steering away from what we already have
     while len(all_sentences) < count:
         remaining = count - len(all_sentences)
         current_batch_size = min(batch_size, remaining)
@@ -243,18 +377,16 @@ def generate_sentences(
         
         while retries < max_retries_per_batch and len(batch_sentences) < current_batch_size:
             try:
-                if active_provider == "ollama":
-                    sentences = _generate_with_ollama(prompt)
-                else:
-                    sentences = _generate_with_openai(prompt)
+                sentences = generate_batch(prompt, current_batch_size)
                 
                 # Validate sentences contain the word
-                word_lower = word.lower()
                 valid_sentences = [s for s in sentences if word_lower in s.lower()]
                 
-                # Filter duplicates
+                # Filter duplicates (seen covers both earlier batches and this one)
                 for s in valid_sentences:
-                    if s not in all_sentences and s not in batch_sentences:
+                    key = dedupe_key(s)
+                    if key not in seen:
+                        seen.add(key)
                         batch_sentences.append(s)
                         if len(batch_sentences) >= current_batch_size:
                             break
@@ -273,6 +405,7 @@ def generate_sentences(
                 retries += 1
         
         all_sentences.extend(batch_sentences)
+        _emit_new()
         print(f"✅ Generated {len(batch_sentences)} sentences for '{word}' using {active_provider} (total: {len(all_sentences)}/{count})")
         
         if len(batch_sentences) == 0:
@@ -309,21 +442,29 @@ Return ONLY the sentence text, nothing else."""
 
     try:
         if active_provider == "ollama":
-            response = requests.post(
+            # Only the first line is used, so stop streaming once it is complete
+            with _http.post(
                 f"{_ollama_base_url}/api/generate",
                 json={
                     "model": _ollama_model,
                     "prompt": prompt,
-                    "stream": False,
+                    "stream": True,
                     "options": {"temperature": 0.9}
                 },
-                timeout=60
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"Ollama error: {response.status_code}")
+                timeout=OLLAMA_REGENERATE_TIMEOUT,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    raise Exception(f"Ollama error: {response.status_code}")
+                
+                buf = ""
+                for token in _iter_ollama_tokens(response):
+                    buf += token
+                    # Done once a newline follows the first non-whitespace text
+                    if "\n" in token and "\n" in buf.lstrip():
+                        break
             
-            sentence = response.json().get("response", "").strip()
+            sentence = buf.strip().split("\n", 1)[0].strip()
         else:
             client = _get_openai_client()
             response = client.chat.completions.create(
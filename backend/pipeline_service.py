@@ -0,0 +1,127 @@
+"""
+Pipeline Service - Overlapped Sentence Generation and Synthesis
+
+Feeds sentences from the LLM into Google TTS as each batch arrives, so
+synthesis of the first batch runs while later batches are still being
+generated.
+"""
+
+import os
+import asyncio
+from datetime import datetime
+from typing import List, Dict, Optional
+
+from llm_service import generate_sentences
+from google_tts_service import (
+    DEFAULT_OUTPUT_DIR,
+    DEFAULT_VOICE,
+    async_client_session,
+    prune_tts_cache,
+    sanitize_filename,
+    synthesize_speech_async
+)
+
+
+async def generate_and_synthesize_async(
+    word: str,
+    count: int = 5,
+    voice_name: str = DEFAULT_VOICE,
+    output_dir: str = DEFAULT_OUTPUT_DIR,
+    context: Optional[str] = None,
+    provider: str = None,
+    concurrency: int = 10
+) -> List[Dict]:
+    """
+    Generate sentences for a word and synthesize them as they are produced.
+
+    The LLM runs in a worker thread and pushes each accepted batch onto an
+    asyncio.Queue; `concurrency` consumer tasks pull sentences off the
+    queue and synthesize them.
+
+    Args:
+        word: The mispronounced word to include in sentences
+        count: Number of sentences to generate
+        voice_name: Google TTS voice to use
+        output_dir: Directory to save .wav files
+        context: Optional context/domain for the sentences
+        provider: Override the default LLM provider (openai/ollama)
+        concurrency: Maximum simultaneous TTS requests
+
+    Returns:
+        List of result dicts (with 'index' and 'word'), in generation order
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    results = {}
+
+    def _enqueue(batch: List[str]):
+        # Called from the LLM worker thread
+        for sentence in batch:
+            loop.call_soon_threadsafe(queue.put_nowait, sentence)
+
+    async def _produce():
+        try:
+            await asyncio.to_thread(
+                generate_sentences, word, count, context, provider=provider, on_batch=_enqueue
+            )
+        finally:
+            # One end-of-stream sentinel per consumer, queued after every sentence
+            for _ in range(concurrency):
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    async def _consume():
+        while True:
+            text = await queue.get()
+            if text is None:
+                return
+            index = len(results)
+            results[index] = None
+            filename = f"train_{timestamp}_{index:03d}_{sanitize_filename(text)}.wav"
+            try:
+                result = await synthesize_speech_async(
+                    text, os.path.join(output_dir, filename), semaphore, voice_name=voice_name
+                )
+            except Exception as e:
+                # e.g. client creation failed; record it instead of aborting the gather
+                print(f"❌ TTS synthesis error: {e}")
+                result = {"success": False, "error": str(e), "text": text}
+            result["index"] = index
+            result["word"] = word
+            results[index] = result
+
+    # The gRPC channel is shared by every consumer and closed once the pipeline ends
+    async with async_client_session():
+        await asyncio.gather(_produce(), *(_consume() for _ in range(concurrency)))
+
+    ordered = [results[i] for i in range(len(results))]
+    successful = sum(1 for r in ordered if r.get("success"))
+    print(f"\n📊 Pipeline complete: {successful}/{len(ordered)} files generated for '{word}'")
+
+    await asyncio.to_thread(prune_tts_cache)
+
+    return ordered
+
+
+def generate_and_synthesize(
+    word: str,
+    count: int = 5,
+    voice_name: str = DEFAULT_VOICE,
+    output_dir: str = DEFAULT_OUTPUT_DIR,
+    context: Optional[str] = None,
+    provider: str = None,
+    concurrency: int = 10
+) -> List[Dict]:
+    """
+    Generate and synthesize sentences for a word with LLM and TTS overlapped.
+
+    Synchronous wrapper around generate_and_synthesize_async; must not be
+    called from inside a running event loop.
+    """
+    return asyncio.run(generate_and_synthesize_async(
+        word, count, voice_name, output_dir, context, provider, concurrency
+    ))
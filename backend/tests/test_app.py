@@ -0,0 +1,135 @@
+"""
+API tests for the Flask backend.
+
+Google TTS is replaced by a fake that writes a small file, and every test
+runs in its own temporary directory and database.
+
+Run from the backend directory with: python -m unittest discover tests
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+import zipfile
+
+from werkzeug.http import parse_options_header
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _fake_synthesize_speech(text, output_path, voice_name, **kwargs):
+    """Stand-in for google_tts_service.synthesize_speech that writes the text itself."""
+    with open(output_path, 'wb') as f:
+        f.write(text.encode('utf-8'))
+    return {
+        "success": True,
+        "path": output_path,
+        "text": text,
+        "voice": voice_name,
+        "duration_seconds": 1.0,
+        "file_size_bytes": os.path.getsize(output_path)
+    }
+
+
+class AppTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(tmp.name)
+
+        import app
+        import training_database
+        os.makedirs(app.TRAINING_OUTPUT_DIR, exist_ok=True)
+        training_database.DATABASE_PATH = os.path.join(tmp.name, "training_data.db")
+
+        self.app = app
+        self.original_synthesize = app.synthesize_speech
+        app.synthesize_speech = _fake_synthesize_speech
+        self.addCleanup(setattr, app, 'synthesize_speech', self.original_synthesize)
+
+        self.client = app.app.test_client()
+
+    def generate(self, texts, word="kelime"):
+        response = self.client.post('/api/generate-audio', json={
+            "sentences": [{"text": text, "word": word} for text in texts]
+        })
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def test_generate_audio_shared_prefix_gets_distinct_files(self):
+        texts = [f"Bu kelime çok güzel bir {suffix} cümledir." for suffix in
+                 ("kısa", "uzun", "yeni", "eski", "garip")]
+
+        data = self.generate(texts)
+
+        paths = [f["path"] for f in data["files"]]
+        self.assertEqual(data["generated"], 5)
+        self.assertEqual(len(set(paths)), 5)
+        for text, path in zip(texts, paths):
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), text)
+
+    def test_generate_audio_bypasses_tts_cache(self):
+        calls = []
+
+        def _recording_synthesize(text, output_path, voice_name, **kwargs):
+            calls.append(kwargs)
+            return _fake_synthesize_speech(text, output_path, voice_name)
+
+        self.app.synthesize_speech = _recording_synthesize
+        self.generate(["Önbellek kullanılmadan üretilen bir cümle."])
+
+        self.assertEqual(len(calls), 1)
+        self.assertIsNone(calls[0]["cache_dir"])
+
+    def test_folder_zip_metadata_keeps_quotes_verbatim(self):
+        self.generate(['O "merhaba" dedi|sonra\ngitti.'])
+
+        response = self.client.get('/api/folders/kelime/download')
+        self.assertEqual(response.status_code, 200)
+        with zipfile.ZipFile(io.BytesIO(response.get_data())) as archive:
+            metadata = archive.read('metadata.csv').decode('utf-8')
+
+        self.assertEqual(metadata, 'O "merhaba" dedi sonra gitti.|1.wav\n')
+
+    def test_export_metadata_keeps_quotes_verbatim(self):
+        data = self.generate(['O "merhaba" dedi.'])
+
+        response = self.client.post('/api/export', json={})
+        self.assertEqual(response.status_code, 200)
+        with open(response.get_json()["metadata_path"], encoding='utf-8') as f:
+            metadata = f.read()
+
+        self.assertEqual(metadata, f'{data["files"][0]["path"]}|O "merhaba" dedi.\n')
+
+    def test_export_response_shape(self):
+        self.generate(["Dışa aktarılacak ilk cümle.", "Dışa aktarılacak ikinci cümle."])
+
+        response = self.client.post('/api/export', json={})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(set(data), {"success", "metadata_path", "item_count"})
+        self.assertTrue(data["success"])
+        self.assertEqual(data["item_count"], 2)
+
+        # Everything was exported, so a second export has nothing to write
+        self.assertEqual(self.client.post('/api/export', json={}).status_code, 400)
+
+    def test_folder_zip_filename_with_quote_is_escaped(self):
+        self.generate(["Tırnaklı klasör için bir cümle."], word='a"b')
+
+        response = self.client.get('/api/folders/a"b/download')
+        self.assertEqual(response.status_code, 200)
+        response.get_data()
+
+        _, options = parse_options_header(response.headers['Content-Disposition'])
+        self.assertTrue(options['filename'].startswith('a"b_'))
+        self.assertTrue(options['filename'].endswith('.zip'))
+
+
+if __name__ == "__main__":
+    unittest.main()
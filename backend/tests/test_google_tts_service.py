@@ -0,0 +1,57 @@
+"""
+Tests for the Google TTS service's on-disk cache (no API calls).
+
+Run from the backend directory with: python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import google_tts_service
+
+
+class TTSCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.cache_dir = os.path.join(self.tmp, "tts_cache")
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_restoring_an_entry_does_not_rewrite_linked_files(self):
+        first = self.write("first.wav", b"first audio")
+        second = self.write("second.wav", b"other")
+
+        google_tts_service._store_in_cache(self.cache_dir, "key", first, {"text": "bir"})
+        # Drop the sidecar so the second store replaces the cached wav
+        os.remove(os.path.join(self.cache_dir, "key.json"))
+        google_tts_service._store_in_cache(self.cache_dir, "key", second, {"text": "iki"})
+
+        with open(first, "rb") as f:
+            self.assertEqual(f.read(), b"first audio")
+        with open(os.path.join(self.cache_dir, "key.wav"), "rb") as f:
+            self.assertEqual(f.read(), b"other")
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ["key.json", "key.wav"])
+
+    def test_existing_entry_is_kept(self):
+        first = self.write("first.wav", b"first audio")
+        second = self.write("second.wav", b"other")
+
+        google_tts_service._store_in_cache(self.cache_dir, "key", first, {"text": "bir"})
+        google_tts_service._store_in_cache(self.cache_dir, "key", second, {"text": "bir"})
+
+        with open(os.path.join(self.cache_dir, "key.wav"), "rb") as f:
+            self.assertEqual(f.read(), b"first audio")
+
+
+if __name__ == "__main__":
+    unittest.main()
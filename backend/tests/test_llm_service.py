@@ -0,0 +1,54 @@
+"""
+Tests for the LLM service, with the Ollama HTTP API replaced by canned streams.
+
+Run from the backend directory with: python -m unittest discover tests
+"""
+
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm_service
+
+
+class _FakeStreamingResponse:
+    """Minimal requests.Response stand-in for a streaming /api/generate reply."""
+
+    status_code = 200
+
+    def __init__(self, tokens):
+        self.lines = [json.dumps({"response": token, "done": False}).encode() for token in tokens]
+        self.lines.append(json.dumps({"response": "", "done": True}).encode())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+
+class RegenerateSingleSentenceTestCase(unittest.TestCase):
+    def regenerate(self, tokens):
+        with mock.patch.object(llm_service._http, "post", return_value=_FakeStreamingResponse(tokens)):
+            return llm_service.regenerate_single_sentence("API", [], provider="ollama")
+
+    def test_leading_newline_token_keeps_whole_sentence(self):
+        tokens = ["\nBu", " API", " çok", " hızlı", " çalışıyor.", "\n", "İkinci satır."]
+
+        self.assertEqual(self.regenerate(tokens), "Bu API çok hızlı çalışıyor.")
+
+    def test_stops_at_end_of_first_line(self):
+        tokens = ["Bu API", " güvenilir.\nİkinci", " satır."]
+
+        self.assertEqual(self.regenerate(tokens), "Bu API güvenilir.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+Tests for the overlapped LLM -> TTS pipeline (no API calls).
+
+Run from the backend directory with: python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline_service
+
+
+def _fake_generate_sentences(word, count, context, provider=None, on_batch=None):
+    sentences = [f"{word} cümlesi {i}." for i in range(count)]
+    on_batch(sentences)
+    return sentences
+
+
+class PipelineTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.output_dir = tmp.name
+
+        for name, value in (("generate_sentences", _fake_generate_sentences),
+                            ("prune_tts_cache", lambda: None)):
+            patcher = mock.patch.object(pipeline_service, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_synthesis_error_is_recorded_per_sentence(self):
+        async def _flaky_synthesize(text, output_path, semaphore, voice_name=None):
+            if text.endswith("1."):
+                raise RuntimeError("client creation failed")
+            return {"success": True, "path": output_path, "text": text}
+
+        with mock.patch.object(pipeline_service, "synthesize_speech_async", _flaky_synthesize):
+            results = pipeline_service.generate_and_synthesize(
+                "kelime", count=3, output_dir=self.output_dir, concurrency=2
+            )
+
+        self.assertEqual([r["index"] for r in results], [0, 1, 2])
+        self.assertEqual([r["success"] for r in results], [True, False, True])
+        self.assertEqual(results[1]["error"], "client creation failed")
+        self.assertEqual(results[1]["word"], "kelime")
+
+
+if __name__ == "__main__":
+    unittest.main()
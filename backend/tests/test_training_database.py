@@ -0,0 +1,79 @@
+"""
+Tests for the SQLite training database layer.
+
+Run from the backend directory with: python -m unittest discover tests
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import training_database
+
+
+class TrainingDatabaseTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.db_path = os.path.join(tmp.name, "training_data.db")
+        training_database.DATABASE_PATH = self.db_path
+
+    def test_check_existing_audio_sees_updates_from_other_connections(self):
+        item_id = training_database.add_training_item("kelime", "Bekleyen bir cümle.")
+        self.assertIsNone(training_database.check_existing_audio("Bekleyen bir cümle.", "kelime"))
+
+        # Another process (e.g. a second gunicorn worker) finishes the old row
+        other = sqlite3.connect(self.db_path)
+        with other:
+            other.execute(
+                "UPDATE training_items SET status = 'generated', wav_path = ? WHERE id = ?",
+                ("kelime/bekleyen.wav", item_id)
+            )
+        other.close()
+
+        existing = training_database.check_existing_audio("Bekleyen bir cümle.", "kelime")
+        self.assertIsNotNone(existing)
+        self.assertEqual(existing["id"], item_id)
+
+    def test_check_existing_audio_sees_inserts_from_other_connections(self):
+        self.assertIsNone(training_database.check_existing_audio("Yeni bir cümle.", "kelime"))
+
+        other = sqlite3.connect(self.db_path)
+        with other:
+            other.execute("""
+                INSERT INTO training_items (word, sentence, wav_path, status)
+                VALUES ('kelime', 'Yeni bir cümle.', 'kelime/yeni.wav', 'generated')
+            """)
+        other.close()
+
+        self.assertIsNotNone(training_database.check_existing_audio("Yeni bir cümle.", "kelime"))
+
+    def test_change_log_is_trimmed_and_trimmed_positions_reload(self):
+        for name, value in (("AUDIO_KEY_LOG_ROWS", 5), ("AUDIO_KEY_LOG_TRIM_EVERY", 5)):
+            self.addCleanup(setattr, training_database, name, getattr(training_database, name))
+            setattr(training_database, name, value)
+
+        # Sync this process's position before another process writes
+        self.assertIsNone(training_database.check_existing_audio("Cümle 0.", "kelime"))
+
+        other = sqlite3.connect(self.db_path)
+        with other:
+            other.executemany("""
+                INSERT INTO training_items (word, sentence, wav_path, status)
+                VALUES ('kelime', ?, ?, 'generated')
+            """, [(f"Cümle {i}.", f"kelime/{i}.wav") for i in range(12)])
+        log_rows = other.execute("SELECT COUNT(*) FROM audio_key_changes").fetchone()[0]
+        other.close()
+
+        self.assertLessEqual(log_rows, 10)
+        # The entry for "Cümle 0." was trimmed, so it is found through a full reload
+        self.assertIsNotNone(training_database.check_existing_audio("Cümle 0.", "kelime"))
+        self.assertIsNotNone(training_database.check_existing_audio("Cümle 11.", "kelime"))
+
+
+if __name__ == "__main__":
+    unittest.main()
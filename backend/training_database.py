@@ -5,18 +5,34 @@ This module handles persistence for generated training data items.
 """
 
 import os
+import atexit
+import queue
 import sqlite3
 import json
 import threading
-from datetime import datetime
-from typing import List, Dict, Optional
+import weakref
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional, Tuple
 from contextlib import contextmanager
 
 # Database file path
 DATABASE_PATH = "training_data.db"
 
-# Thread-safe lock
-_db_lock = threading.Lock()
+# Bound parameters per statement (SQLite's historical SQLITE_MAX_VARIABLE_NUMBER)
+SQLITE_MAX_PARAMS = 999
+
+# One persistent connection per thread, so connect/schema parsing and the page
+# cache are paid once per worker thread instead of once per call. Connections
+# are also tracked per Thread object so they can all be closed at exit.
+_tls = threading.local()
+_thread_connections = weakref.WeakKeyDictionary()
+_thread_connections_lock = threading.Lock()
+
+# Schema setup and the background threads are deferred to first use (see _ensure_init)
+_initialized_path = None
+_workers_started = False
+_init_lock = threading.Lock()
 
 
 def get_db_path() -> str:
@@ -24,52 +40,371 @@ def get_db_path() -> str:
     return DATABASE_PATH
 
 
+# Audio files of deleted rows are unlinked by a background worker so deletes
+# don't block on the filesystem (started with the writer, see _start_workers)
+_unlink_queue = queue.Queue()
+
+
+def _unlink_worker():
+    """Remove queued wav files until the process exits."""
+    while True:
+        path = _unlink_queue.get()
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"⚠️ Could not delete audio file: {e}")
+        finally:
+            _unlink_queue.task_done()
+
+
+# Superset of (hash(sentence), word) keys that have generated audio, so
+# check_existing_audio can answer "not generated yet" without a query. Keys are
+# never removed (several rows may share one); a stale hit just falls through to
+# SQLite. The set is loaded in full once, then kept current from the
+# audio_key_changes log, which triggers fill whenever a row is inserted or
+# updated into the generated state (by any thread or process). The log is only
+# read when the calling connection's data_version changes.
+#
+# Retention: the log keeps roughly the newest AUDIO_KEY_LOG_ROWS entries; a
+# trigger trims older ones every AUDIO_KEY_LOG_TRIM_EVERY inserts. A process
+# whose position has been trimmed away falls back to a full reload.
+AUDIO_KEY_LOG_ROWS = 10000
+AUDIO_KEY_LOG_TRIM_EVERY = 1000
+_existing_keys = set()
+_existing_change_id = None
+_existing_lock = threading.Lock()
+
+
+def _remember_existing(rows: Iterable):
+    """Record (sentence, word, status, wav_path) rows that have generated audio."""
+    with _existing_lock:
+        for sentence, word, status, wav_path in rows:
+            if status == 'generated' and wav_path is not None:
+                _existing_keys.add((hash(sentence), word))
+
+
+def _sync_existing_keys(conn: sqlite3.Connection):
+    """Pull in rows that became generated since the last sync if another connection has committed."""
+    global _existing_change_id
+    version = conn.execute("PRAGMA data_version").fetchone()[0]
+    if _existing_change_id is not None and getattr(_tls, "data_version", None) == version:
+        return
+    with _existing_lock:
+        if _existing_change_id is not None:
+            # Log ids are contiguous, so a gap means unseen entries were trimmed
+            oldest = conn.execute("SELECT MIN(id) FROM audio_key_changes").fetchone()[0]
+            if oldest is not None and oldest > _existing_change_id + 1:
+                _existing_change_id = None
+        
+        if _existing_change_id is None:
+            # Read the log position first: changes racing the full load are
+            # replayed on the next sync, which only re-adds keys
+            _existing_change_id = conn.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM audio_key_changes"
+            ).fetchone()[0]
+            cursor = conn.execute("""
+                SELECT sentence, word FROM training_items
+                WHERE status = 'generated' AND wav_path IS NOT NULL
+            """)
+            _existing_keys.update((hash(sentence), word) for sentence, word in cursor)
+        else:
+            cursor = conn.execute("""
+                SELECT c.id, t.sentence, t.word FROM audio_key_changes c
+                JOIN training_items t ON t.id = c.item_id
+                WHERE c.id > ?
+                ORDER BY c.id
+            """, (_existing_change_id,))
+            for change_id, sentence, word in cursor:
+                _existing_keys.add((hash(sentence), word))
+                _existing_change_id = change_id
+    _tls.data_version = version
+
+
+def _chunked(values: Iterable, size: int = SQLITE_MAX_PARAMS):
+    """Yield lists of at most `size` values, for chunked IN (...) clauses."""
+    iterator = iter(values)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+@lru_cache(maxsize=64)
+def _in_sql(template: str, count: int) -> str:
+    """Fill a template's IN ({}) with `count` placeholders (full chunks reuse one string)."""
+    return template.format(",".join("?" * count))
+
+
+def _configure_connection(conn: sqlite3.Connection):
+    """Apply the per-connection PRAGMAs (journal_mode is set once in init_training_db)."""
+    # NORMAL sync is safe with WAL; wait on a busy writer instead of failing
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+
+
+def _thread_connection() -> sqlite3.Connection:
+    """Return this thread's connection, opening it on first use."""
+    conn = getattr(_tls, "conn", None)
+    if conn is None or _tls.path != DATABASE_PATH:
+        if conn is not None:
+            conn.close()
+        # Larger statement cache: each distinct SQL string is prepared once per connection
+        conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        _configure_connection(conn)
+        _tls.conn = conn
+        _tls.path = DATABASE_PATH
+        with _thread_connections_lock:
+            _thread_connections[threading.current_thread()] = conn
+    return conn
+
+
+@atexit.register
+def close_connections():
+    """Close every thread's persistent connection."""
+    with _thread_connections_lock:
+        connections = list(_thread_connections.values())
+        _thread_connections.clear()
+    for conn in connections:
+        conn.close()
+
+
 @contextmanager
 def get_connection():
-    """Context manager for database connections."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
+    """
+    Context manager for database connections.
+    
+    Yields the calling thread's persistent connection. Work that was not
+    committed is rolled back on exit, as closing a connection used to do.
+    The schema is created on first use.
+    """
+    _ensure_init()
+    conn = _thread_connection()
     try:
         yield conn
     finally:
-        conn.close()
+        if conn.in_transaction:
+            conn.rollback()
+
+
+# Every write runs on a single writer thread. Callers queue a job and wait;
+# whatever jobs are queued when the writer comes round commit together in one
+# transaction (group commit), each inside its own savepoint so a failing job
+# only undoes itself. Reads still run on the calling thread's connection.
+WRITE_BATCH_MAX = 64
+_write_queue = queue.Queue()
+
+
+class _WriteJob:
+    """A queued write: `fn(conn)` runs on the writer thread, `done` is set after commit."""
+    
+    __slots__ = ("fn", "done", "result", "error")
+    
+    def __init__(self, fn: Callable[[sqlite3.Connection], Any]):
+        self.fn = fn
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _writer():
+    """Drain the write queue, committing each batch of jobs in one transaction."""
+    while True:
+        jobs = [_write_queue.get()]
+        while len(jobs) < WRITE_BATCH_MAX:
+            try:
+                jobs.append(_write_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        conn = None
+        try:
+            conn = _thread_connection()
+            conn.execute("BEGIN IMMEDIATE")
+            for job in jobs:
+                conn.execute("SAVEPOINT write_job")
+                try:
+                    job.result = job.fn(conn)
+                except Exception as e:
+                    job.error = e
+                    conn.execute("ROLLBACK TO write_job")
+                conn.execute("RELEASE write_job")
+            conn.commit()
+        except Exception as e:
+            # Nothing in the batch was committed
+            if conn is not None and conn.in_transaction:
+                conn.rollback()
+            for job in jobs:
+                job.error = e
+        finally:
+            for job in jobs:
+                job.done.set()
+                _write_queue.task_done()
+
+
+def _start_workers():
+    """Start the writer and unlink threads and drain their queues at exit."""
+    global _workers_started
+    threading.Thread(target=_unlink_worker, name="wav-unlink", daemon=True).start()
+    threading.Thread(target=_writer, name="db-writer", daemon=True).start()
+    
+    # atexit runs handlers last-registered first: pending writes finish, then
+    # the unlinks they queued, and only then does close_connections run
+    atexit.register(_unlink_queue.join)
+    atexit.register(_write_queue.join)
+    _workers_started = True
+
+
+def _run_write(fn: Callable[[sqlite3.Connection], Any]) -> Any:
+    """
+    Run `fn(conn)` on the writer thread and wait for its batch to commit.
+    
+    `fn` must not commit; its return value (or exception) is handed back
+    to the caller once the data is durable.
+    """
+    _ensure_init()
+    job = _WriteJob(fn)
+    _write_queue.put(job)
+    job.done.wait()
+    if job.error is not None:
+        raise job.error
+    return job.result
+
+
+def _ensure_init():
+    """Start the background workers once and run init_training_db once per database path."""
+    if _initialized_path == DATABASE_PATH and _workers_started:
+        return
+    with _init_lock:
+        if not _workers_started:
+            _start_workers()
+        if _initialized_path != DATABASE_PATH:
+            init_training_db()
 
 
 def init_training_db():
     """Initialize the training database with required tables."""
-    with _db_lock:
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Training items table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS training_items (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    word TEXT NOT NULL,
-                    sentence TEXT NOT NULL,
-                    wav_path TEXT,
-                    status TEXT DEFAULT 'pending',
-                    voice TEXT DEFAULT 'tr-TR-Wavenet-D',
-                    duration_seconds REAL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    exported_at TIMESTAMP,
-                    metadata TEXT
-                )
-            """)
-            
-            # Generation batches table for tracking
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS generation_batches (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    word TEXT NOT NULL,
-                    sentence_count INTEGER DEFAULT 0,
-                    audio_count INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            conn.commit()
-            print("✅ Training database initialized")
+    global _initialized_path, _existing_change_id
+    
+    # Not get_connection(): that would re-enter _ensure_init
+    conn = _thread_connection()
+    try:
+        # WAL is persistent in the database file, so it only needs setting once.
+        # It lets readers run alongside a writer (not applicable to :memory:).
+        if DATABASE_PATH != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        
+        cursor = conn.cursor()
+        
+        # Training items table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS training_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                word TEXT NOT NULL,
+                sentence TEXT NOT NULL,
+                wav_path TEXT,
+                status TEXT DEFAULT 'pending',
+                voice TEXT DEFAULT 'tr-TR-Wavenet-D',
+                duration_seconds REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                exported_at TIMESTAMP,
+                metadata TEXT
+            )
+        """)
+        
+        # Generation batches table for tracking
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS generation_batches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                word TEXT NOT NULL,
+                sentence_count INTEGER DEFAULT 0,
+                audio_count INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_items_word_status
+            ON training_items(word, status)
+        """)
+        
+        # Duplicate check before every synthesis (check_existing_audio)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_items_sentence_word
+            ON training_items(sentence, word)
+        """)
+        
+        # Export and folder listings only look at rows that have audio
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_items_status_wav
+            ON training_items(status, word, created_at)
+            WHERE wav_path IS NOT NULL
+        """)
+        
+        # Case-insensitive folder deletes (delete_items_by_word)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_items_word_lower
+            ON training_items(LOWER(word))
+        """)
+        
+        # Log of rows entering the generated state, for _sync_existing_keys
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS audio_key_changes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_id INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_items_generated_insert
+            AFTER INSERT ON training_items
+            WHEN NEW.status = 'generated' AND NEW.wav_path IS NOT NULL
+            BEGIN
+                INSERT INTO audio_key_changes (item_id) VALUES (NEW.id);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_items_generated_update
+            AFTER UPDATE OF sentence, word, status, wav_path ON training_items
+            WHEN NEW.status = 'generated' AND NEW.wav_path IS NOT NULL
+            BEGIN
+                INSERT INTO audio_key_changes (item_id) VALUES (NEW.id);
+            END
+        """)
+        # Bounded retention, see AUDIO_KEY_LOG_ROWS
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_audio_key_changes_trim
+            AFTER INSERT ON audio_key_changes
+            WHEN NEW.id % {AUDIO_KEY_LOG_TRIM_EVERY} = 0
+            BEGIN
+                DELETE FROM audio_key_changes WHERE id <= NEW.id - {AUDIO_KEY_LOG_ROWS};
+            END
+        """)
+        
+        conn.commit()
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+    
+    # Keys from a previously initialized database do not apply to this one
+    with _existing_lock:
+        _existing_keys.clear()
+        _existing_change_id = None
+    
+    _initialized_path = DATABASE_PATH
+    print("✅ Training database initialized")
+
+
+# Hot statements live in module constants so every call passes the same string
+# and hits the connection's prepared-statement cache
+_INSERT_ITEM_SQL = """
+    INSERT INTO training_items 
+    (word, sentence, wav_path, voice, duration_seconds, status)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
 
 
 def add_training_item(
@@ -94,16 +429,78 @@ def add_training_item(
     Returns:
         The ID of the created item
     """
-    with _db_lock:
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO training_items 
-                (word, sentence, wav_path, voice, duration_seconds, status)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (word, sentence, wav_path, voice, duration_seconds, status))
-            conn.commit()
-            return cursor.lastrowid
+    def _insert(conn):
+        cursor = conn.execute(
+            _INSERT_ITEM_SQL, (word, sentence, wav_path, voice, duration_seconds, status)
+        )
+        return cursor.lastrowid
+    
+    item_id = _run_write(_insert)
+    _remember_existing([(sentence, word, status, wav_path)])
+    return item_id
+
+
+def add_training_items_bulk(items: List) -> List[int]:
+    """
+    Add multiple training items with one prepared statement in a single transaction.
+    
+    Args:
+        items: List of dicts with the same fields as add_training_item, or
+            (word, sentence, wav_path, voice, duration_seconds, status)
+            tuples, which are bound as-is
+    
+    Returns:
+        The IDs of the created items, in input order
+    """
+    if not items:
+        return []
+    
+    rows = [
+        item if isinstance(item, tuple) else (
+            item['word'],
+            item['sentence'],
+            item.get('wav_path'),
+            item.get('voice', "tr-TR-Wavenet-D"),
+            item.get('duration_seconds'),
+            item.get('status', "pending")
+        )
+        for item in items
+    ]
+    
+    def _insert(conn):
+        conn.executemany(_INSERT_ITEM_SQL, rows)
+        # IDs are consecutive: the executemany runs inside the writer's BEGIN IMMEDIATE
+        # transaction, which holds SQLite's write lock against other processes too
+        return conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    
+    last_id = _run_write(_insert)
+    _remember_existing((row[1], row[0], row[5], row[2]) for row in rows)
+    return list(range(last_id - len(rows) + 1, last_id + 1))
+
+
+_UPDATE_STATUS_SQL = """
+    UPDATE training_items SET status = ? WHERE id = ?
+    RETURNING sentence, word, status, wav_path
+"""
+
+# Generation-complete update: status, wav_path and duration_seconds together
+_GENERATED_FIELDS = {'status', 'wav_path', 'duration_seconds'}
+_UPDATE_GENERATED_SQL = """
+    UPDATE training_items SET status = ?, wav_path = ?, duration_seconds = ? WHERE id = ?
+    RETURNING sentence, word, status, wav_path
+"""
+
+
+@lru_cache(maxsize=64)
+def _update_sql(fields: tuple) -> str:
+    """Build the generic UPDATE for a tuple of field names."""
+    set_clause = ", ".join([f"{k} = ?" for k in fields])
+    return f"""
+        UPDATE training_items 
+        SET {set_clause}
+        WHERE id = ?
+        RETURNING sentence, word, status, wav_path
+    """
 
 
 def update_training_item(
@@ -123,45 +520,71 @@ def update_training_item(
     if not kwargs:
         return False
     
-    allowed_fields = {'word', 'sentence', 'wav_path', 'status', 'voice', 
-                      'duration_seconds', 'exported_at', 'metadata'}
-    
-    updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
-    if not updates:
+    # Fast paths for the common shapes skip building the SET clause
+    if len(kwargs) == 1 and 'status' in kwargs:
+        sql = _UPDATE_STATUS_SQL
+        values = (kwargs['status'], item_id)
+    elif kwargs.keys() == _GENERATED_FIELDS:
+        sql = _UPDATE_GENERATED_SQL
+        values = (kwargs['status'], kwargs['wav_path'], kwargs['duration_seconds'], item_id)
+    else:
+        allowed_fields = {'word', 'sentence', 'wav_path', 'status', 'voice', 
+                          'duration_seconds', 'exported_at', 'metadata'}
+        
+        updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
+        if not updates:
+            return False
+        
+        sql = _update_sql(tuple(updates))
+        values = list(updates.values()) + [item_id]
+    
+    row = _run_write(lambda conn: conn.execute(sql, values).fetchone())
+    
+    if row is None:
         return False
-    
-    set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
-    values = list(updates.values()) + [item_id]
-    
-    with _db_lock:
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"""
-                UPDATE training_items 
-                SET {set_clause}
-                WHERE id = ?
-            """, values)
-            conn.commit()
-            return cursor.rowcount > 0
+    _remember_existing([tuple(row)])
+    return True
+
+
+# Columns the read functions may project instead of SELECT *
+_ITEM_COLUMNS = frozenset({
+    'id', 'word', 'sentence', 'wav_path', 'status', 'voice',
+    'duration_seconds', 'created_at', 'exported_at', 'metadata'
+})
 
+# Narrower row for export: no metadata or timestamps
+EXPORT_COLUMNS = ('id', 'word', 'sentence', 'wav_path', 'duration_seconds', 'voice')
 
-def get_training_item(item_id: int) -> Optional[Dict]:
-    """Get a single training item by ID."""
-    with _db_lock:
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM training_items WHERE id = ?
-            """, (item_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+
+@lru_cache(maxsize=64)
+def _select_list(columns: Tuple[str, ...]) -> str:
+    """Validate a column projection and render it for a SELECT."""
+    if columns == ('*',):
+        return '*'
+    unknown = set(columns) - _ITEM_COLUMNS
+    if unknown:
+        raise ValueError(f"Unknown training_items columns: {', '.join(sorted(unknown))}")
+    return ", ".join(columns)
+
+
+_GET_ITEM_SQL = "SELECT {} FROM training_items WHERE id = ?"
+
+
+def get_training_item(item_id: int, columns: Tuple[str, ...] = ('*',)) -> Optional[Dict]:
+    """Get a single training item by ID, optionally only the given columns."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(_GET_ITEM_SQL.format(_select_list(columns)), (item_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
 
 
 def get_training_items(
     word: Optional[str] = None,
     status: Optional[str] = None,
     limit: int = 100,
-    offset: int = 0
+    offset: int = 0,
+    columns: Tuple[str, ...] = ('*',)
 ) -> List[Dict]:
     """
     Get training items with optional filters.
@@ -171,30 +594,30 @@ def get_training_items(
         status: Filter by status
         limit: Maximum items to return
         offset: Pagination offset
+        columns: Columns to return (default: all)
     
     Returns:
         List of training items
     """
-    with _db_lock:
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            
-            query = "SELECT * FROM training_items WHERE 1=1"
-            params = []
-            
-            if word:
-                query += " AND word = ?"
-                params.append(word)
-            
-            if status:
-                query += " AND status = ?"
-                params.append(status)
-            
-            query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
-            params.extend([limit, offset])
-            
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        
+        query = f"SELECT {_select_list(columns)} FROM training_items WHERE 1=1"
+        params = []
+        
+        if word:
+            query += " AND word = ?"
+            params.append(word)
+        
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        
+        query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+        
+        cursor.execute(query, params)
+        return [dict(row) for row in cursor.fetchall()]
 
 
 def delete_training_item(item_id: int) -> bool:
@@ -207,26 +630,17 @@ def delete_training_item(item_id: int) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    # Get item first to check for wav file
-    item = get_training_item(item_id)
-    
-    with _db_lock:
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM training_items WHERE id = ?", (item_id,))
-            conn.commit()
-            deleted = cursor.rowcount > 0
+    # One statement deletes the row and hands back its wav file
+    row = _run_write(lambda conn: conn.execute(
+        "DELETE FROM training_items WHERE id = ? RETURNING wav_path", (item_id,)
+    ).fetchone())
     
     # Delete associated wav file if exists
-    if deleted and item and item.get('wav_path'):
-        try:
-            if os.path.exists(item['wav_path']):
-                os.remove(item['wav_path'])
-                print(f"🗑️ Deleted audio file: {item['wav_path']}")
-        except Exception as e:
-            print(f"⚠️ Could not delete audio file: {e}")
+    if row and row['wav_path']:
+        _unlink_queue.put(row['wav_path'])
+        print(f"🗑️ Queued audio file for deletion: {row['wav_path']}")
     
-    return deleted
+    return row is not None
 
 
 def get_training_stats() -> Dict:
@@ -236,66 +650,91 @@ def get_training_stats() -> Dict:
     Returns:
         Dictionary with counts by status and other stats
     """
-    with _db_lock:
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Count by status
-            cursor.execute("""
-                SELECT status, COUNT(*) as count 
-                FROM training_items 
-                GROUP BY status
-            """)
-            status_counts = {row['status']: row['count'] for row in cursor.fetchall()}
-            
-            # Count unique words
-            cursor.execute("""
-                SELECT COUNT(DISTINCT word) as unique_words 
-                FROM training_items
-            """)
-            unique_words = cursor.fetchone()['unique_words']
-            
-            # Total items
-            cursor.execute("SELECT COUNT(*) as total FROM training_items")
-            total = cursor.fetchone()['total']
-            
-            return {
-                "total": total,
-                "pending": status_counts.get("pending", 0),
-                "generated": status_counts.get("generated", 0),
-                "exported": status_counts.get("exported", 0),
-                "unique_words": unique_words
-            }
-
-
-def get_items_for_export(word: Optional[str] = None) -> List[Dict]:
+    # One pass over the table with filtered aggregates
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT COUNT(*) AS total,
+                   COUNT(*) FILTER (WHERE status = 'pending') AS pending,
+                   COUNT(*) FILTER (WHERE status = 'generated') AS generated,
+                   COUNT(*) FILTER (WHERE status = 'exported') AS exported,
+                   COUNT(DISTINCT word) AS unique_words
+            FROM training_items
+        """)
+        return dict(cursor.fetchone())
+
+
+def get_items_for_export(
+    word: Optional[str] = None,
+    columns: Tuple[str, ...] = EXPORT_COLUMNS
+) -> Iterator[Dict]:
     """
     Get all generated items ready for export.
     
+    Rows are yielded one at a time straight off the cursor, so an export
+    never holds the whole result set in memory.
+    
     Args:
         word: Optional filter by word
+        columns: Columns to return (default: EXPORT_COLUMNS)
+    
+    Yields:
+        Items with generated audio, ordered by word and creation time
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        
+        query = f"""
+            SELECT {_select_list(columns)} FROM training_items 
+            WHERE status = 'generated' AND wav_path IS NOT NULL
+        """
+        params = []
+        
+        if word:
+            query += " AND word = ?"
+            params.append(word)
+        
+        query += " ORDER BY word, created_at"
+        
+        cursor.execute(query, params)
+        for row in cursor:
+            yield dict(row)
+
+
+def get_folder_counts() -> List[Dict]:
+    """
+    Get audio file counts per word folder.
+    
+    Folders on disk are named after the lowercased word, so counts for
+    differently-cased spellings of a word are merged.
     
     Returns:
-        List of items with generated audio
+        List of dicts with 'name' and 'file_count'
     """
-    with _db_lock:
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            
-            query = """
-                SELECT * FROM training_items 
-                WHERE status = 'generated' AND wav_path IS NOT NULL
-            """
-            params = []
-            
-            if word:
-                query += " AND word = ?"
-                params.append(word)
-            
-            query += " ORDER BY word, created_at"
-            
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT word, COUNT(*) as file_count
+            FROM training_items
+            WHERE status IN ('generated', 'exported') AND wav_path IS NOT NULL
+            GROUP BY word
+        """)
+        rows = cursor.fetchall()
+    
+    # Python's lower() handles Turkish letters, SQLite's LOWER() only ASCII
+    counts = {}
+    for row in rows:
+        name = row['word'].lower()
+        counts[name] = counts.get(name, 0) + row['file_count']
+    
+    return [{"name": name, "file_count": count} for name, count in counts.items() if name]
+
+
+_MARK_EXPORTED_SQL = """
+    UPDATE training_items 
+    SET status = 'exported', exported_at = CURRENT_TIMESTAMP
+    WHERE id IN ({})
+"""
 
 
 def mark_items_exported(item_ids: List[int]) -> int:
@@ -311,19 +750,21 @@ def mark_items_exported(item_ids: List[int]) -> int:
     if not item_ids:
         return 0
     
-    placeholders = ",".join(["?" for _ in item_ids])
-    now = datetime.now().isoformat()
-    
-    with _db_lock:
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"""
-                UPDATE training_items 
-                SET status = 'exported', exported_at = ?
-                WHERE id IN ({placeholders})
-            """, [now] + item_ids)
-            conn.commit()
-            return cursor.rowcount
+    def _mark(conn):
+        updated_count = 0
+        # Timestamp comes from SQLite itself, same as created_at
+        for chunk in _chunked(item_ids, 500):
+            cursor = conn.execute(_in_sql(_MARK_EXPORTED_SQL, len(chunk)), chunk)
+            updated_count += cursor.rowcount
+        return updated_count
+    
+    return _run_write(_mark)
+
+
+_DELETE_IDS_SQL = """
+    DELETE FROM training_items WHERE id IN ({})
+    RETURNING wav_path
+"""
 
 
 def bulk_delete_items(item_ids: List[int]) -> int:
@@ -339,35 +780,33 @@ def bulk_delete_items(item_ids: List[int]) -> int:
     if not item_ids:
         return 0
     
-    # Get items first to find wav files to delete
-    items_to_delete = []
-    for item_id in item_ids:
-        item = get_training_item(item_id)
-        if item:
-            items_to_delete.append(item)
-    
-    placeholders = ",".join(["?" for _ in item_ids])
+    def _delete(conn):
+        wav_paths = []
+        deleted_count = 0
+        # Delete rows chunk by chunk in one transaction, collecting their wav files
+        for chunk in _chunked(item_ids):
+            rows = conn.execute(_in_sql(_DELETE_IDS_SQL, len(chunk)), chunk).fetchall()
+            deleted_count += len(rows)
+            wav_paths.extend(row['wav_path'] for row in rows if row['wav_path'])
+        return deleted_count, wav_paths
     
-    with _db_lock:
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"DELETE FROM training_items WHERE id IN ({placeholders})", item_ids)
-            conn.commit()
-            deleted_count = cursor.rowcount
+    deleted_count, wav_paths = _run_write(_delete)
     
-    # Delete associated wav files
-    for item in items_to_delete:
-        if item.get('wav_path'):
-            try:
-                if os.path.exists(item['wav_path']):
-                    os.remove(item['wav_path'])
-            except Exception as e:
-                print(f"⚠️ Could not delete audio file: {e}")
+    # Delete associated wav files once the rows are gone
+    for wav_path in wav_paths:
+        _unlink_queue.put(wav_path)
     
     print(f"🗑️ Bulk deleted {deleted_count} items")
     return deleted_count
 
 
+_CHECK_EXISTING_SQL = """
+    SELECT * FROM training_items 
+    WHERE sentence = ? AND word = ? AND status = 'generated' AND wav_path IS NOT NULL
+    LIMIT 1
+"""
+
+
 def check_existing_audio(sentence: str, word: str) -> Optional[Dict]:
     """
     Check if audio already exists for a sentence+word combination.
@@ -379,29 +818,23 @@ def check_existing_audio(sentence: str, word: str) -> Optional[Dict]:
     Returns:
         Existing item dict if found, None otherwise
     """
-    with _db_lock:
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM training_items 
-                WHERE sentence = ? AND word = ? AND status = 'generated' AND wav_path IS NOT NULL
-                LIMIT 1
-            """, (sentence, word))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+    with get_connection() as conn:
+        _sync_existing_keys(conn)
+        if (hash(sentence), word) not in _existing_keys:
+            return None
+        
+        cursor = conn.cursor()
+        cursor.execute(_CHECK_EXISTING_SQL, (sentence, word))
+        row = cursor.fetchone()
+        return dict(row) if row else None
 
 
 def add_generation_batch(word: str, sentence_count: int = 0) -> int:
     """Track a generation batch."""
-    with _db_lock:
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO generation_batches (word, sentence_count)
-                VALUES (?, ?)
-            """, (word, sentence_count))
-            conn.commit()
-            return cursor.lastrowid
+    return _run_write(lambda conn: conn.execute("""
+        INSERT INTO generation_batches (word, sentence_count)
+        VALUES (?, ?)
+    """, (word, sentence_count)).lastrowid)
 
 
 def delete_items_by_word(word: str) -> int:
@@ -414,24 +847,18 @@ def delete_items_by_word(word: str) -> int:
     Returns:
         Number of items deleted
     """
-    with _db_lock:
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM training_items WHERE LOWER(word) = LOWER(?)", (word,))
-            conn.commit()
-            deleted_count = cursor.rowcount
+    deleted_count = _run_write(lambda conn: conn.execute(
+        "DELETE FROM training_items WHERE LOWER(word) = LOWER(?)", (word,)
+    ).rowcount)
     
     print(f"🗑️ Deleted {deleted_count} database entries for word '{word}'")
     return deleted_count
 
 
-# Initialize on import
-init_training_db()
-
-
 if __name__ == "__main__":
     # Test the database
     print("Testing Training Database...")
+    init_training_db()
     
     # Add test item
     item_id = add_training_item(
@@ -0,0 +1,10 @@
+"""
+WSGI entry point for running the backend under a production server.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from app import app
+
+if __name__ == "__main__":
+    app.run(host='0.0.0.0', port=5001, threaded=True)
@@ -1,22 +1,64 @@
 
 import os
+import json
+import time
 from google.cloud import texttospeech
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def list_voices():
-    try:
+# Voices rarely change, so the API response is cached on disk for a week
+VOICES_CACHE_TTL = 7 * 24 * 60 * 60
+
+_client = None
+
+
+def get_client():
+    """Create the TTS client once and reuse its channel."""
+    global _client
+    if _client is None:
         if os.path.exists("backend/google_credentials.json"):
             os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "backend/google_credentials.json"
-            
-        client = texttospeech.TextToSpeechClient()
-        response = client.list_voices(language_code="tr-TR")
-        
-        print(f"Found {len(response.voices)} voices for tr-TR:")
-        for voice in response.voices:
-            print(f"Name: {voice.name}, Gender: {voice.ssml_gender.name}")
-            
+        _client = texttospeech.TextToSpeechClient()
+    return _client
+
+
+def fetch_voices(language_code="tr-TR"):
+    """Return voices for a language, from the disk cache when it is fresh."""
+    cache_path = f"voices_cache_{language_code}.json"
+
+    try:
+        if time.time() - os.path.getmtime(cache_path) < VOICES_CACHE_TTL:
+            with open(cache_path, encoding="utf-8") as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    response = get_client().list_voices(language_code=language_code)
+    voices = [
+        {
+            "name": voice.name,
+            "gender": voice.ssml_gender.name,
+            "language_codes": list(voice.language_codes),
+            "sample_rate": voice.natural_sample_rate_hertz
+        }
+        for voice in response.voices
+    ]
+
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump(voices, f, ensure_ascii=False, indent=2)
+
+    return voices
+
+
+def list_voices():
+    try:
+        voices = fetch_voices("tr-TR")
+
+        print(f"Found {len(voices)} voices for tr-TR:")
+        for voice in voices:
+            print(f"Name: {voice['name']}, Gender: {voice['gender']}")
+
     except Exception as e:
         print(f"Error: {e}")
 